@@ -1,10 +1,14 @@
 from typing import Tuple, Callable, Dict, Union, Optional, Sequence, Set, List
 from inspect import signature
-from copy import copy, deepcopy
+from collections import defaultdict
+from operator import attrgetter
+import math
 import numpy as np
-import regex as re
+import re
 from tabulate import tabulate
 
+_NAME_RE = re.compile(r'^[A-Za-z]\w*$', re.ASCII)
+
 class classproperty(property):
     def __get__(self, obj, objtype=None):
         return super(classproperty, self).__get__(objtype)
@@ -14,8 +18,11 @@ class classproperty(property):
         super(classproperty, self).__delete__(type(obj))
 
 class DerivateRule:
+    __slots__ = ('_in_vars_names', '_out_vars_names', '_n_out_vars', '_func')
+
     def __init__(self, output_names: Union[Tuple[str,...], str], func: Callable, input_names: Optional[Tuple[str,...]] = None):
         self._out_vars_names = output_names if isinstance(output_names, tuple) else (output_names,)
+        self._n_out_vars = len(self._out_vars_names)
         func_arg_names = signature(func).parameters.keys()
         self._func = func
         if input_names is not None:
@@ -42,12 +49,12 @@ class DerivateRule:
             # apply rule
             out_vars_values = self._func(*[ variables[name] for name in self._in_vars_names ])
             # parse result depening on number of ouput variables
-            if len(self._out_vars_names) == 1:
+            if self._n_out_vars == 1:
                 return { self._out_vars_names[0]: out_vars_values }
-            elif len(self._out_vars_names) == len(out_vars_values):
+            elif self._n_out_vars == len(out_vars_values):
                 return dict(zip(self._out_vars_names, out_vars_values))
             else:
-                raise TypeError('Derivative rule {self._in_vars_names} -> {self._out_vars_names}: incorrect function signature')
+                raise TypeError(f'Derivative rule {self._in_vars_names} -> {self._out_vars_names}: incorrect function signature')
         else:
             # nothing is deduced
             return {}
@@ -55,7 +62,141 @@ class DerivateRule:
     def __repr__(self) -> str:
         return f'DerivateRule({self._in_vars_names} -> {self._out_vars_names})'
 
+class AliasRule(DerivateRule):
+    ''' Rule which copies variable to its alias, optionally multiplied or divided by scale.
+
+    Deducer emits it inline instead of calling its function.
+    '''
+    __slots__ = ('_scale', '_inverse')
+
+    def __init__(self, output_name: str, input_name: str, scale: Optional[float] = None, inverse: bool = False):
+        if scale is None:
+            func = lambda x: x
+        elif inverse:
+            func = lambda x: x / scale
+        else:
+            func = lambda x: x * scale
+        super(AliasRule, self).__init__((output_name,), func, (input_name,))
+        self._scale = scale
+        self._inverse = inverse
+
+    @property
+    def scale(self) -> Optional[float]:
+        return self._scale
+
+    @property
+    def inverse(self) -> bool:
+        return self._inverse
+
+def order_rules(rules: Sequence[DerivateRule], known_names: Set[str]) -> Tuple[DerivateRule, ...]:
+    ''' Find rules applicable to given known variables and order them as they fire.
+
+    Rules are scanned in repeated passes in declaration order until a pass deduces no new variable. 
+    Rule fires in the first pass in which all its input variables are known. 
+    If several rules deduce the same variable, value of the first fired rule is kept and the others are only checked, 
+    so this order defines which value wins.
+
+    Parameters
+    ----------
+    rules: Sequence[DerivateRule]
+        Derivate rules in declaration order.
+    known_names: Set[str]
+        Names of known variables.
+
+    Returns
+    -------
+    ordered_rules: Tuple[DerivateRule, ...]
+        Rules which fire, each one once, in firing order.
+    '''
+    known_names = set(known_names)
+    pending_rules = list(rules)
+    ordered_rules = []
+    n_variables_deduced = len(known_names)
+    while n_variables_deduced > 0:
+        n_variables_deduced = 0
+        not_fired_rules = []
+        for rule in pending_rules:
+            if known_names.issuperset(rule.input_variables_names):
+                ordered_rules.append(rule)
+                for name in rule.output_variables_names:
+                    if name not in known_names:
+                        n_variables_deduced += 1
+                        known_names.add(name)
+            else:
+                not_fired_rules.append(rule)
+        pending_rules = not_fired_rules
+    return tuple(ordered_rules)
+
+def _deduced_value(value: float, name: str, rule: DerivateRule) -> float:
+    ''' Check value of new variable deduced by rule. '''
+    if math.isnan(value):
+        raise ValueError(f'DeductorBase: variable {name} derived from {rule} is NAN.')
+    return value
+
+def _check_variable(variables: Dict[str, float], name: str, value: float, rule: DerivateRule, rel_tolerance: float) -> None:
+    ''' Check that value deduced by rule is consistent with known value. '''
+    if math.isnan(value):
+        raise ValueError(f'DeductorBase: variable {name} derived from {rule} is NAN.')
+    old_value = variables[name]
+    abs_old_value = math.fabs(old_value)
+    abs_value = math.fabs(value)
+    if math.fabs(value - old_value) > rel_tolerance*(abs_old_value if abs_old_value > abs_value else abs_value):
+        raise ValueError(f'DeductorBase: value of {name} is {old_value}, but it contradicts to value {value} deudced from {rule}')
+
+def compile_deducer(rules: Sequence[DerivateRule], known_names: Set[str], func_name: str = 'deduce') -> Callable[[Dict[str, float], float], None]:
+    ''' Generate function which applies rules to variables dictionary with straight-line code.
+
+    Rules are applied in given order, each one once, without checking if their inputs are known. 
+    Since known variables are fixed, each output is either stored as new variable or checked against known value.
+
+    Parameters
+    ----------
+    rules: Sequence[DerivateRule]
+        Rules in firing order as returned by `order_rules`.
+    known_names: Set[str]
+        Names of variables known before deduction.
+    func_name: str
+        Name of generated function.
+
+    Returns
+    -------
+    deduce: Callable[[Dict[str, float], float], None]
+        Function `deduce(variables, rel_tolerance)` which updates variables dictionary in place.
+    '''
+    namespace = { '_deduced_value': _deduced_value, '_check_variable': _check_variable }
+    lines = [ f'def {func_name}(V, rel_tol):' ]
+    known_names = set(known_names)
+    for k, rule in enumerate(rules):
+        namespace[f'_r{k}'] = rule
+        if isinstance(rule, AliasRule):
+            # alias is copied without function call
+            value = f'V[{rule.input_variables_names[0]!r}]'
+            if rule.scale is not None:
+                namespace[f'_s{k}'] = rule.scale
+                value += f' / _s{k}' if rule.inverse else f' * _s{k}'
+        else:
+            namespace[f'_f{k}'] = rule._func
+            value = f'_f{k}(' + ', '.join(f'V[{name!r}]' for name in rule.input_variables_names) + ')'
+        if len(rule.output_variables_names) > 1:
+            lines.append(f'    values = {value}')
+            lines.append(f'    if len(values) != {len(rule.output_variables_names)}:')
+            message = f'Derivative rule {rule.input_variables_names} -> {rule.output_variables_names}: incorrect function signature'
+            lines.append(f'        raise TypeError({message!r})')
+        for l, name in enumerate(rule.output_variables_names):
+            if len(rule.output_variables_names) > 1:
+                value = f'values[{l}]'
+            if name in known_names:
+                lines.append(f'    _check_variable(V, {name!r}, {value}, _r{k}, rel_tol)')
+            else:
+                lines.append(f'    V[{name!r}] = _deduced_value({value}, {name!r}, _r{k})')
+                known_names.add(name)
+    lines.append('    return None')
+    exec(compile('\n'.join(lines), f'<{func_name}>', 'exec'), namespace)
+    return namespace[func_name]
+
 class AnnotatedFloat(float):
+    __slots__ = ('units', 'desc')
+
     def __new__(cls, value: float, units: Optional[str], desc: Optional[str]):
         instance = super(AnnotatedFloat, cls).__new__(cls, value)
         instance.units = units
@@ -66,10 +207,13 @@ class AnnotatedFloat(float):
         return f'{float(self)} {self.units} ({self.desc})'
 
 class GroupItem:
-    def __init__(self, groups: Sequence[str] = []):
-        self.groups = copy(groups)
+    __slots__ = ('groups',)
+
+    def __init__(self, groups: Sequence[str] = ()):
+        self.groups = tuple(groups)
 
 class Attribute(GroupItem):
+    __slots__ = ('_name', '_units', '_desc', '_setter')
     set_value = None
     get_value = None
     
@@ -80,10 +224,12 @@ class Attribute(GroupItem):
         self._name = name
         self._units = units
         self._desc = desc
+        # setter of class property, None for read-only attributes
+        self._setter = self.set_value
 
     @staticmethod
     def name_is_valid(name: str) -> bool:
-        return re.match(r'^[A-Za-z][A-Za-z0-9_]*$', name)
+        return _NAME_RE.match(name) is not None
 
     @property
     def name(self) -> str:
@@ -100,13 +246,17 @@ class Attribute(GroupItem):
     def add_to_class(self, cls: type) -> None:
         if hasattr(cls, self._name):
             raise TypeError(f'Dublicate attribute {self._name}')
-        setattr(cls, self._name, property(self.get_value, self.set_value))
+        setattr(cls, self._name, property(self.get_value, self._setter))
 
 class BaseAttribute(Attribute):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(BaseAttribute, self).__init__(*args, **kwargs)
         if 'base' not in self.groups:
-            self.groups.append('base')
+            self.groups = self.groups + ('base',)
+        # specialize setter for this attribute
+        self._setter = self._make_setter()
             
     @property
     def derivate_rules(self) -> List[DerivateRule]:
@@ -115,17 +265,35 @@ class BaseAttribute(Attribute):
     def get_value(self, obj) -> AnnotatedFloat:
         return getattr(obj, '_' + self._name)
 
+    def _make_setter(self) -> Callable[[object, float], None]:
+        name = self._name
+        field_name = '_' + self._name
+        units = self._units
+        desc = self._desc
+        def set_value(obj, value: float) -> None:
+            value = AnnotatedFloat(value, units, desc)
+            setattr(obj, field_name, value)
+            # track defined base attributes
+            if math.isnan(value):
+                obj._defined_mask &= ~obj._BASE_BIT[name]
+            else:
+                obj._defined_mask |= obj._BASE_BIT[name]
+        return set_value
+
     def set_value(self, obj, value: float) -> None:
-        setattr(obj, '_' + self._name, AnnotatedFloat(value, self._units, self._desc))
+        self._setter(obj, value)
 
     def __repr__(self) -> str:
         return f'BaseAttribute "{self._name}" ({self._units}) --- "{self._desc}"'
 
 class DerivedAttribute(Attribute):
+    __slots__ = ('_func', '_input_attrs_names')
+
     def __init__(self, name: str, units: Optional[str], desc: Optional[str], 
                  func: Callable[[float,...], float], **kwargs):
         super(DerivedAttribute, self).__init__(name, units, desc, **kwargs)
         self._func = func
+        self._input_attrs_names = tuple(signature(func).parameters)
 
     @property
     def derivate_rules(self) -> List[DerivateRule]:
@@ -133,12 +301,11 @@ class DerivedAttribute(Attribute):
 
     @property
     def input_attrs_names(self) -> Sequence[str]:
-        return signature(self._func).parameters.keys()
+        return self._input_attrs_names
     
     def get_value(self, obj) -> AnnotatedFloat:
-        input_vars_names = self.input_attrs_names
-        input_vars = [ getattr(obj, name) for name in input_vars_names ]
-        if any(np.isnan(input_vars)):
+        input_vars = [ getattr(obj, name) for name in self._input_attrs_names ]
+        if any(math.isnan(v) for v in input_vars):
             return AnnotatedFloat(np.nan, self._units, self._desc)
         else:
             value = self._func(*input_vars)
@@ -153,6 +320,8 @@ class DerivedAttribute(Attribute):
         return f'DerivedAttribute "{self._name}" ({self._units}) from {list(self.input_attrs_names)} --- "{self._desc}"'
 
 class AliasAttribute(Attribute):
+    __slots__ = ('_original_name',)
+
     def __init__(self, name: str, original_name: str, **kwargs):
         super(AliasAttribute, self).__init__(name, None, None, **kwargs)
         self._original_name = original_name
@@ -165,15 +334,15 @@ class AliasAttribute(Attribute):
 
     @property
     def derivate_rules(self) -> List[DerivateRule]:
-        return [ DerivateRule( (self._name,), lambda x: x, (self._original_name,) ),
-                 DerivateRule( (self._original_name,), lambda x: x, (self._name,) ) ]
+        return [ AliasRule(self._name, self._original_name),
+                 AliasRule(self._original_name, self._name) ]
 
     def add_to_class(self, cls: type) -> None:
         if not hasattr(cls, self._original_name):
             raise TypeError(f'Alias atribute {self._name} requires attributes {self._original_name} to exist.')
         # disable setter if origina attr is not assignable
         if getattr(cls, self._original_name).setter is None:
-            self.set_value = None
+            self._setter = None
         # extract original attribute metainformation
         if hasattr(cls, '_ATTRIBUTES'):
             for attr in cls._ATTRIBUTES:
@@ -188,6 +357,8 @@ class AliasAttribute(Attribute):
         return f'AliasAttribute "{self._name}" for "{self._original_name}"'
 
 class ScaledAliasAttribute(Attribute):
+    __slots__ = ('_scale', '_original_name')
+
     def __init__(self, name: str, scale: float, original_name: str, *args, **kwargs):
         super(ScaledAliasAttribute, self).__init__(name, *args, **kwargs)
         self._scale = scale
@@ -195,8 +366,8 @@ class ScaledAliasAttribute(Attribute):
   
     @property
     def derivate_rules(self) -> List[DerivateRule]:
-        return [ DerivateRule( (self._name,), lambda x: x * self._scale, (self._original_name,) ),
-                 DerivateRule( (self._original_name,), lambda x: x / self._scale, (self._name,) ) ]
+        return [ AliasRule(self._name, self._original_name, self._scale),
+                 AliasRule(self._original_name, self._name, self._scale, inverse = True) ]
     
     def get_value(self, obj) -> AnnotatedFloat:
         original_value = getattr(obj, self._original_name)
@@ -211,7 +382,7 @@ class ScaledAliasAttribute(Attribute):
             raise TypeError(f'Alias atribute {self._name} requires attributes {self._original_name} to exist.')
         # disable setter if origina attr is not assignable
         if getattr(cls, self._original_name).setter is None:
-            self.set_value = None
+            self._setter = None
         super(ScaledAliasAttribute, self).add_to_class(cls)
 
     def __repr__(self) -> str:
@@ -220,21 +391,21 @@ class ScaledAliasAttribute(Attribute):
 class Validator:
     def __init__(self, func: Callable[[float,...], bool], desc: str, strict: bool = False):
         self._func = func
+        self._args_names = tuple(signature(func).parameters)
         self._desc = desc
         self._strict = strict
 
     def __call__(self, m) -> bool:
         # collect arguments 
-        args_names = signature(self._func).parameters.keys()
-        args = { name : getattr(m, name) for name in args_names }
+        args = tuple( getattr(m, name) for name in self._args_names )
         # check that all arguments are defined
-        if np.any(np.isnan(list(args.values()))):
+        if any(math.isnan(v) for v in args):
             # model is not fully defined, but this is not error
             if self._strict:
-                raise ValueError(f'{type(m).__name__}: {self._desc}: attributes {str.join(", ", args_names)} must be defined.')
+                raise ValueError(f'{type(m).__name__}: {self._desc}: attributes {str.join(", ", self._args_names)} must be defined.')
         else:
             # validate
-            if not self._func(**args):
+            if not self._func(*args):
                 raise ValueError(f'{type(m).__name__}: {self._desc}')
 
     @property
@@ -245,9 +416,10 @@ class Validator:
         return f'ModelValidator({self._desc})'
 
 class DeductorBase:
-    _ATTRIBUTES: List[Attribute] = []
-    _DERIVATE_RULES: List[DerivateRule] = []
-    _VALIDATORS: List[Validator] = []
+    _ATTRIBUTES: Sequence[Attribute] = ()
+    _DERIVATE_RULES: Sequence[DerivateRule] = ()
+    _VALIDATORS: Sequence[Validator] = ()
+    _defined_mask: int = 0
     
     def __init_subclass__(cls, **kwargs):
         super(DeductorBase, cls).__init_subclass__(**kwargs)
@@ -268,6 +440,24 @@ class DeductorBase:
                     # get derivative rules
                     cls._ALL_DERIVATE_RULES.extend(attr.derivate_rules)
                     cls._ALL_ATTRIBUTES.append(attr)
+        cls._BASE_ATTRIBUTES_NAMES = tuple(cls._BASE_ATTRIBUTES_NAMES)
+        # bits of defined base attributes mask
+        cls._BASE_BIT = { name: 1 << k for k, name in enumerate(cls._BASE_ATTRIBUTES_NAMES) }
+        cls._BASE_FULL_MASK = (1 << len(cls._BASE_ATTRIBUTES_NAMES)) - 1
+        # attributes lookup tables
+        cls._ATTR_BY_NAME = {}
+        cls._ATTR_BY_GROUP = defaultdict(list)
+        for attr in cls._ALL_ATTRIBUTES:
+            cls._ATTR_BY_NAME.setdefault(attr.name, attr)
+            for group in dict.fromkeys(attr.groups):
+                cls._ATTR_BY_GROUP[group].append(attr)
+        # display table rows: attribute name and value getter
+        cls._DISPLAY = tuple( (attr.name, attrgetter(attr.name)) for attr in cls._ALL_ATTRIBUTES )
+        cls._DISPLAY_BY_GROUP = { group: tuple( (attr.name, attrgetter(attr.name)) for attr in attrs ) for group, attrs in cls._ATTR_BY_GROUP.items() }
+        # names accepted by constructor
+        cls._VALID_INPUT_NAMES = frozenset(cls._BASE_ATTRIBUTES_NAMES) | frozenset(name for rule in cls._ALL_DERIVATE_RULES for name in rule.input_variables_names)
+        # deduction functions for given input variables names, generated on demand
+        cls._DEDUCERS = {}
         # add properties (only for current class because superclass properties are inherited)
         for attr in cls._ATTRIBUTES:
             attr.add_to_class(cls)
@@ -278,36 +468,16 @@ class DeductorBase:
         # vaiables
         variables = kwargs
         # check input variables names:
-        valid_input_names = set(self._BASE_ATTRIBUTES_NAMES)
-        for rule in self._ALL_DERIVATE_RULES:
-            valid_input_names.update(rule.input_variables_names) 
-        for name in variables.keys():
-            if name not in valid_input_names:
-                raise ValueError(f'DeductorBase: unknown input variable {name}, valid are {valid_input_names}')
-        # deduce variables
-        n_variables_deduced = len(variables)
-        variables_names = set(variables.keys())
-        while n_variables_deduced > 0:
-            n_variables_deduced = 0
-            for rule in self._ALL_DERIVATE_RULES:
-                # derive variables
-                new_variables = rule(variables, variables_names)
-                # check them
-                for name, value in new_variables.items():
-                    # check value
-                    if np.isnan(value):
-                        raise ValueError(f'DeductorBase: variable {name} derived from {rule} is NAN.')
-                    # check if variable exists
-                    old_value = variables.get(name)
-                    if old_value is None:
-                        # new value is deduced
-                        n_variables_deduced += 1
-                        variables[name] = value
-                        variables_names.add(name)
-                    else:
-                        # variable already exists
-                        if abs(value - old_value) > self._rel_tolerance*max(abs(old_value), abs(value)):
-                              raise ValueError(f'DeductorBase: value of {name} is {old_value}, but it contradicts to value {value} deudced from {rule}')
+        unknown_names = variables.keys() - self._VALID_INPUT_NAMES
+        if unknown_names:
+            raise ValueError(f'DeductorBase: unknown input variables {unknown_names}, valid are {set(self._VALID_INPUT_NAMES)}')
+        # deduce variables: rules are applied once in order they fire for given input names
+        input_names = frozenset(variables.keys())
+        deduce = self._DEDUCERS.get(input_names)
+        if deduce is None:
+            rules = order_rules(self._ALL_DERIVATE_RULES, input_names)
+            deduce = self._DEDUCERS[input_names] = compile_deducer(rules, input_names, f'deduce_{type(self).__name__}')
+        deduce(variables, self._rel_tolerance)
         # set base attributes
         for name in self._BASE_ATTRIBUTES_NAMES:
             value = variables.get(name)
@@ -324,37 +494,30 @@ class DeductorBase:
 
     @classmethod
     def get_attributes_by_group(cls, group: str) -> List[Attribute]:
-        return [ attr for attr in cls._ALL_ATTRIBUTES if group in attr.groups ]
+        return list(cls._ATTR_BY_GROUP.get(group, ()))
 
     @classmethod
     def get_attribute_by_name(cls, name: str) -> Optional[Attribute]:
-        for attr in cls._ALL_ATTRIBUTES:
-            if name == attr.name:
-                return attr
-        return None
+        return cls._ATTR_BY_NAME.get(name)
 
     @classproperty 
     def validators(cls) -> List[Validator]:
         return cls._ALL_VALIDATORS
 
     def is_fully_defined(self) -> bool:
-        for name in self._BASE_ATTRIBUTES_NAMES:
-            if np.isnan(getattr(self, name)):
-                return False
-        return True
+        return self._defined_mask == self._BASE_FULL_MASK
 
     def validate(self):
         for validator in self._VALIDATORS:
             validator(self)
         
     def to_string(self, group: str = 'base', tablefmt="simple") -> str:
-        display_all = group == 'all'
+        rows = self._DISPLAY if group == 'all' else self._DISPLAY_BY_GROUP.get(group, ())
         # form table
         table = []
-        for attr in self._ALL_ATTRIBUTES:
-            if display_all or group in attr.groups:
-                value = getattr(self, attr.name)
-                table.append([attr.name, value if not np.isnan(value) else None, value.units, value.desc])
+        for name, getter in rows:
+            value = getter(self)
+            table.append([name, value if not math.isnan(value) else None, value.units, value.desc])
         return tabulate(table, headers=['Name', 'Value', 'Units', 'Description'], tablefmt = tablefmt)
             
     def __repr__(self) -> str:
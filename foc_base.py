@@ -1,5 +1,16 @@
 import math
+from typing import NamedTuple
 import numpy as np
+from numba import njit
+
+#
+# CONSTANTS
+#
+
+SQRT3 = math.sqrt(3.0)
+SQRT3_OVER_2 = SQRT3 / 2.0
+SQRT3_OVER_3 = SQRT3 / 3.0
+
 #
 # DATA TYPES
 #
@@ -9,6 +20,9 @@ class PointBase(np.ndarray):
         
         Provide access to ndarray elements via named fields.
         ndarray have the same size as number of fields.
+
+        Points are convenient for single values but every operation pays ndarray subclass overhead, 
+        use PointArray classes for bulk computations.
     '''
     __fields_names__ = ()
 
@@ -39,28 +53,27 @@ class PointBase(np.ndarray):
     def __init_subclass__(cls, fields, **kwargs):
         ''' Called upon subclass creation. It adds fields getter and setters. '''
         super(PointBase, cls).__init_subclass__(**kwargs)
-        # store fields list
+        # store fields list and fields indices
         cls.__fields_names__ = fields
-        # add getter and setters for fields
+        cls._FIELD_INDEX = { field: k for k, field in enumerate(fields) }
+        # add getter and setters for fields: access ndarray directly to avoid __getitem__ dispatch
         def get_getter(k):
-            return lambda self: self[k]
+            return lambda self: np.ndarray.__getitem__(self, k)
         def get_setter(k):
-            return lambda self, value: self.__setitem__(k, value)
+            return lambda self, value: np.ndarray.__setitem__(self, k, value)
         for k, field in enumerate(cls.__fields_names__):
             setattr(cls, field, property(get_getter(k), get_setter(k)))
 
     def __getitem__(self, key):
         ''' Access to elements by fields names. '''
-        if key in self.__fields_names__:
-            return getattr(self, key)
-        else: 
-            return super(PointBase, self).__getitem__(key)
+        if isinstance(key, str):
+            key = self._FIELD_INDEX.get(key, key)
+        return np.ndarray.__getitem__(self, key)
         
     def __setitem__(self, key, value):
-        if key in self.__fields_names__:
-            setattr(self, key, value)
-        else:
-            return super(PointBase, self).__setitem__(key, value)
+        if isinstance(key, str):
+            key = self._FIELD_INDEX.get(key, key)
+        np.ndarray.__setitem__(self, key, value)
 
     def norm(self):
         return np.sqrt(np.sum(self ** 2))
@@ -78,6 +91,9 @@ class PointDQ(PointBase, fields = ('d', 'q')):
     def park_inv(self, EAngle):
         return PointXY(*park_inv(*self, EAngle))
 
+    def to_abc(self, EAngle):
+        return PointABC(*dq_to_abc(*self, EAngle))
+
 class PointXY(PointBase, fields = ('x', 'y')):
     def __init__(self, x = 0.0, y = 0.0):
         super(PointXY, self).__init__(x, y)
@@ -94,10 +110,109 @@ class PointABC(PointBase, fields = ('a', 'b', 'c')):
 
     def clark(self):
         return PointXY(*clark(*self))
+
+    def to_dq(self, EAngle):
+        return PointDQ(*abc_to_dq(*self, EAngle))
+
+class PointArrayDQ(NamedTuple):
+    ''' Batch of points in rotating frame stored as separate contiguous float64 arrays. '''
+    d: np.ndarray
+    q: np.ndarray
+
+    def park_inv(self, EAngle):
+        return PointArrayXY(*park_inv(self.d, self.q, EAngle))
+
+    def to_abc(self, EAngle):
+        return PointArrayABC(*dq_to_abc(self.d, self.q, EAngle))
+
+class PointArrayXY(NamedTuple):
+    ''' Batch of points in stationary frame stored as separate contiguous float64 arrays. '''
+    x: np.ndarray
+    y: np.ndarray
+
+    def clark_inv(self):
+        return PointArrayABC(*clark_inv(self.x, self.y))
+
+    def park(self, EAngle):
+        return PointArrayDQ(*park(self.x, self.y, EAngle))
+
+class PointArrayABC(NamedTuple):
+    ''' Batch of three phase points stored as separate contiguous float64 arrays. '''
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+
+    def clark(self):
+        return PointArrayXY(*clark(self.a, self.b, self.c))
+
+    def to_dq(self, EAngle):
+        return PointArrayDQ(*abc_to_dq(self.a, self.b, self.c, EAngle))
     
 #
 # HELPER FUNCTIONS
 #
+
+def _signature(n_in: int, n_out: int) -> str:
+    ''' Kernel signature compiled at import: 1-d float64 arrays. '''
+    return f'UniTuple(f8[:],{n_out})({",".join(["f8[:]"] * n_in)})'
+
+def _is_kernel_args(*args) -> bool:
+    ''' Check if arguments match compiled kernels signature. Read-only arrays are not covered by it. '''
+    for arg in args:
+        if type(arg) is not np.ndarray or arg.ndim != 1 or arg.dtype != np.float64 or not arg.flags.writeable:
+            return False
+    return True
+
+@njit(_signature(2, 3), cache=True, fastmath=True)
+def _clark_inv_nb(Ux, Uy):
+    Ua = Ux
+    Ub = -0.5*Ux + SQRT3_OVER_2*Uy
+    Uc = -0.5*Ux - SQRT3_OVER_2*Uy
+    return Ua, Ub, Uc
+
+@njit(_signature(2, 2), cache=True, fastmath=True)
+def _clark2_nb(Ua, Ub):
+    Ux = Ua
+    Uy = (Ua + 2.0*Ub)/SQRT3
+    return Ux, Uy
+
+@njit(_signature(3, 2), cache=True, fastmath=True)
+def _clark3_nb(Ua, Ub, Uc):
+    Ux = (2.0/3.0)*Ua - (1.0/3.0)*Ub - (1.0/3.0)*Uc
+    Uy = SQRT3_OVER_3*(Ub - Uc)
+    return Ux, Uy
+
+@njit(_signature(3, 2), cache=True, fastmath=True)
+def _park_inv_nb(Id, Iq, EAngle):
+    cos = np.cos(EAngle)
+    sin = np.sin(EAngle)
+    Ix = cos*Id - sin*Iq
+    Iy = sin*Id + cos*Iq
+    return Ix, Iy
+
+@njit(_signature(3, 2), cache=True, fastmath=True)
+def _park_nb(Ix, Iy, EAngle):
+    cos = np.cos(EAngle)
+    sin = np.sin(EAngle)
+    Id =   cos*Ix + sin*Iy
+    Iq = - sin*Ix + cos*Iy
+    return Id, Iq
+
+@njit(_signature(3, 3), cache=True, fastmath=True)
+def _dq_to_abc_nb(Id, Iq, EAngle):
+    cos = np.cos(EAngle)
+    sin = np.sin(EAngle)
+    Ix = cos*Id - sin*Iq
+    Iy = sin*Id + cos*Iq
+    return Ix, -0.5*Ix + SQRT3_OVER_2*Iy, -0.5*Ix - SQRT3_OVER_2*Iy
+
+@njit(_signature(4, 2), cache=True, fastmath=True)
+def _abc_to_dq_nb(Ia, Ib, Ic, EAngle):
+    cos = np.cos(EAngle)
+    sin = np.sin(EAngle)
+    Ix = (2.0/3.0)*Ia - (1.0/3.0)*Ib - (1.0/3.0)*Ic
+    Iy = SQRT3_OVER_3*(Ib - Ic)
+    return cos*Ix + sin*Iy, - sin*Ix + cos*Iy
     
 def clark_inv(Ux, Uy):
     ''' Inverse Clark transform: convert two-phase reperesentation to tree phases.
@@ -113,9 +228,11 @@ def clark_inv(Ux, Uy):
     Ub: array_like or numeric
     Uc: array_like or numeric
     '''
+    if type(Ux) is np.ndarray and _is_kernel_args(Ux, Uy):
+        return _clark_inv_nb(Ux, Uy)
     Ua = Ux
-    Ub = -0.5*Ux + (math.sqrt(3.0)/2.0)*Uy
-    Uc = -0.5*Ux - (math.sqrt(3.0)/2.0)*Uy
+    Ub = -0.5*Ux + SQRT3_OVER_2*Uy
+    Uc = -0.5*Ux - SQRT3_OVER_2*Uy
     return Ua, Ub, Uc
     
 def clark(*args):
@@ -133,13 +250,17 @@ def clark(*args):
     Uy: array_like or numeric
     '''
     if len(args) == 2:
+        if type(args[0]) is np.ndarray and _is_kernel_args(*args):
+            return _clark2_nb(*args)
         Ua, Ub = args
         Ux = Ua
-        Uy = (Ua + 2*Ub)/math.sqrt(3)
+        Uy = (Ua + 2*Ub)/SQRT3
     elif len(args) == 3:
+        if type(args[0]) is np.ndarray and _is_kernel_args(*args):
+            return _clark3_nb(*args)
         Ua, Ub, Uc = args
         Ux = (2.0/3.0)*Ua - (1.0/3.0)*Ub - (1.0/3.0)*Uc
-        Uy = (math.sqrt(3.0)/3.0)*(Ub - Uc)
+        Uy = SQRT3_OVER_3*(Ub - Uc)
     else:
         raise ValueError('clark() accepts two or three arguments')
     return Ux, Uy
@@ -163,6 +284,8 @@ def park_inv(Id, Iq, EAngle):
     Iy: array_like or numeric
         Rotating frame y-axis (b-axis).
     '''
+    if type(Id) is np.ndarray and _is_kernel_args(Id, Iq, EAngle):
+        return _park_inv_nb(Id, Iq, EAngle)
     cos = np.cos(EAngle)
     sin = np.sin(EAngle)
     Ix = cos*Id - sin*Iq
@@ -189,8 +312,62 @@ def park(Ix, Iy, EAngle):
     Iq: array_like or numeric
         Rotating frame q-axis.
     '''
+    if type(Ix) is np.ndarray and _is_kernel_args(Ix, Iy, EAngle):
+        return _park_nb(Ix, Iy, EAngle)
     cos = np.cos(EAngle)
     sin = np.sin(EAngle)
     Id =   cos*Ix + sin*Iy
     Iq = - sin*Ix + cos*Iy
     return Id, Iq
+
+def dq_to_abc(Id, Iq, EAngle):
+    ''' Convert rotating frame to three phases: fused inverse Park and inverse Clark transforms.
+
+    Parameters
+    ----------
+    Id: array_like or numeric
+        Rotating frame d-axis.
+    Iq: array_like or numeric
+        Rotating frame q-axis.
+    EAngle: array_like or numeric
+        Electrical angle in radians.
+
+    Returns
+    -------
+    Ia: array_like or numeric
+    Ib: array_like or numeric
+    Ic: array_like or numeric
+    '''
+    if type(Id) is np.ndarray and _is_kernel_args(Id, Iq, EAngle):
+        return _dq_to_abc_nb(Id, Iq, EAngle)
+    cos = np.cos(EAngle)
+    sin = np.sin(EAngle)
+    Ix = cos*Id - sin*Iq
+    Iy = sin*Id + cos*Iq
+    return Ix, -0.5*Ix + SQRT3_OVER_2*Iy, -0.5*Ix - SQRT3_OVER_2*Iy
+
+def abc_to_dq(Ia, Ib, Ic, EAngle):
+    ''' Convert three phases to rotating frame: fused Clark and Park transforms.
+
+    Parameters
+    ----------
+    Ia: array_like or numeric
+    Ib: array_like or numeric
+    Ic: array_like or numeric
+    EAngle: array_like or numeric
+        Electrical angle in radians.
+
+    Returns
+    -------
+    Id: array_like or numeric
+        Rotating frame d-axis.
+    Iq: array_like or numeric
+        Rotating frame q-axis.
+    '''
+    if type(Ia) is np.ndarray and _is_kernel_args(Ia, Ib, Ic, EAngle):
+        return _abc_to_dq_nb(Ia, Ib, Ic, EAngle)
+    cos = np.cos(EAngle)
+    sin = np.sin(EAngle)
+    Ix = (2.0/3.0)*Ia - (1.0/3.0)*Ib - (1.0/3.0)*Ic
+    Iy = SQRT3_OVER_3*(Ib - Ic)
+    return cos*Ix + sin*Iy, - sin*Ix + cos*Iy
@@ -1,76 +1,189 @@
+import math
 import numpy as np
+from numba import njit, prange
 from deductor import DeductorBaseNamed, BaseAttribute, DerivedAttribute, AliasAttribute, ScaledAliasAttribute, DerivateRule, Validator
 from foc_base import PointDQ
 
-def flux_from_nominal_motor_mode(R, L, N, vn, Pn, In, Un, sign = 1, J = np.nan):
-        # quadratic equation a x^2 + b x + c = 0
-        a = 4/9 * (Pn/In)**2
-        b = 4/3* N*vn*L * Pn
-        c = (R*In)**2 + (N*vn*L*In)**2 + 4/3*Pn*R + 4/9*(Pn/In)**2 - Un**2
-        D = b**2 - 4*a*c
-        # check if solution exists
-        if D < 0:
-            return np.nan, None, None, None
-            #raise ValueError('nominal mode: no solution')
-        ctgI = (-b + sign*np.sqrt(D)) / (2*a)
-        # calculate currents
-        sinI = np.sqrt(1 / (1 + ctgI**2)) 
-        Iq = In * sinI
-        Id = np.sqrt(In**2 - Iq**2) * (-1 if ctgI < 0 else 1)
-        # calculate rotor flux
-        Fm = 2/3 * Pn / (N*vn*Iq)
-        # calculate voltages
-        Ud = R*Id - N*vn*L*Iq
-        Uq = R*Iq + N*vn*L*Id + N*vn*Fm
-        # stability analisys
-        stable = None
-        if not np.isnan(J):
-            # Id Iq v
-            A = np.array([[  -R/L,     N*vn,         N*Iq ],
-                          [ -N*vn,     -R/L,   -N*Id-N*Fm ],
-                          [     0, 3/2*N*Fm/J,        0 ]]) 
-            if not np.any(np.isnan(A)):
-                eigvals, _ = np.linalg.eig(A)
-                stable = np.all(np.real(eigvals) < 0)
-        # return result
-        return Fm, PointDQ(Id, Iq), PointDQ(Ud, Uq), stable
-
-def flux_from_nominal_generator_mode(R, L, N, vn, Pn, In, Un, sign = 1, J = np.nan):
-        # quadratic equation a x^2 + b x + c = 0
-        a = 4/9 * (Pn/In)**2
-        b = 4/3* N*vn*L * Pn
-        c = (R*In)**2 + (N*vn*L*In)**2 - 4/3*Pn*R + 4/9*(Pn/In)**2 - Un**2
-        D = b**2 - 4*a*c
-        # check if solution exists
-        if D < 0:
-            return np.nan, None, None, None
-            #raise ValueError('nominal mode: no solution')
-        ctgI = (-b + sign*np.sqrt(D)) / (2*a)
-        # calculate currents
-        sinI = np.sqrt(1 / (1 + ctgI**2)) 
-        Iq = In * sinI
-        Id = np.sqrt(In**2 - Iq**2) * (-1 if ctgI < 0 else 1)
-        # calculate rotor flux
-        Fm = 2/3 * Pn / (N*vn*Iq)
-        # calculate voltages
-        Ud = R*Id + N*vn*L*Iq
-        Uq = R*Iq - N*vn*L*Id - N*vn*Fm
-        # stability analisys 
-        stable = None
-        if not np.isnan(J):
-            # Id Iq v
-            A = np.array([[  -R/L,     -N*vn,     -N*Iq ],
-                          [ N*vn,     -R/L,   N*Id+N*Fm ],
-                          [     0, 3/2*N*Fm/J,        0 ]])
-            if not np.any(np.isnan(A)):
-                eigvals, _ = np.linalg.eig(A)
-                stable = np.all(np.real(eigvals) < 0)
-        # return result
-        return Fm, PointDQ(Id, Iq), PointDQ(Ud, Uq), stable
+#
+# CONSTANTS
+#
+
+_SQRT_2 = math.sqrt(2.0)
+_SQRT_3 = math.sqrt(3.0)
+_SQRT_3_2 = math.sqrt(1.5)
+_SQRT_1_2 = math.sqrt(0.5)
+# rad/s in one rpm
+_RPM = math.pi / 30.0
+_NAN = float('nan')
+
+def _is_stable(A):
+    ''' Check if all eigenvalues of 3x3 matrix have negative real part. 
+    
+    Matrix is given as tuple of rows, elements are floats or arrays of the same shape (stack of matrices).
+    Routh-Hurwitz criterion is applied to characteristic polynomial l^3 + p1 l^2 + p2 l + p3.
+    Matrices with NaN elements are unstable.
+    '''
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = A
+    # trace, sum of principal minors and determinant
+    p1 = -(a00 + a11 + a22)
+    p2 = (a00*a11 - a01*a10) + (a00*a22 - a02*a20) + (a11*a22 - a12*a21)
+    p3 = -(a00*(a11*a22 - a12*a21) - a01*(a10*a22 - a12*a20) + a02*(a10*a21 - a11*a20))
+    return (p1 > 0) & (p3 > 0) & (p1*p2 > p3)
+
+def _is_nominal_stable(R, L, N, vn, J, Fm, Id, Iq, mode_sign):
+    ''' Check stability of nominal mode. Arguments are floats or arrays of the same shape. '''
+    # Id Iq v
+    Nv, NFm, NIq, NId = N*vn, N*Fm, N*Iq, N*Id
+    A = ((          -R/L,  mode_sign*Nv,          mode_sign*NIq ),
+         ( -mode_sign*Nv,          -R/L,  -mode_sign*(NId + NFm) ),
+         (           0.0,     1.5*NFm/J,                    0.0 ))
+    return _is_stable(A)
+
+# scalar solver signature: (Fm, Id, Iq, Ud, Uq, ok)(R, L, N, vn, Pn, In, Un, sign, mode_sign)
+_FLUX_CORE_SIGNATURE = 'Tuple((f8,f8,f8,f8,f8,b1))(f8,f8,f8,f8,f8,f8,f8,f8,f8)'
+
+@njit(_FLUX_CORE_SIGNATURE, cache=True, error_model='numpy')
+def _flux_core_scalar(R, L, N, vn, Pn, In, Un, sign, mode_sign):
+    # common subexpressions
+    Nv = N*vn
+    NvL = Nv*L
+    In2 = In*In
+    PoI = Pn/In
+    PoI2 = PoI*PoI
+    RIn = R*In
+    # quadratic equation a x^2 + b x + c = 0
+    a = 4/9 * PoI2
+    b = 4/3 * NvL*Pn
+    c = RIn*RIn + NvL*NvL*In2 + mode_sign*4/3*Pn*R + a - Un*Un
+    D = b*b - 4*a*c
+    # check if solution exists
+    if D < 0:
+        return math.nan, math.nan, math.nan, math.nan, math.nan, False
+    sqrt_D = math.sqrt(D)
+    inv_2a = 0.5 / a
+    ctgI = (-b + sign*sqrt_D) * inv_2a
+    # calculate currents
+    h = math.hypot(1.0, ctgI)
+    Iq = In / h
+    Id = In * ctgI / h
+    # calculate rotor flux
+    Fm = 2/3 * Pn / (Nv*Iq)
+    # calculate voltages
+    Ud = R*Id - mode_sign*NvL*Iq
+    Uq = R*Iq + mode_sign*(NvL*Id + Nv*Fm)
+    return Fm, Id, Iq, Ud, Uq, True
+
+# specializations with fixed root sign: (Fm, Id, Iq, Ud, Uq, ok)(R, L, N, vn, Pn, In, Un, mode_sign)
+_FLUX_CORE_FIXED_SIGN_SIGNATURE = 'Tuple((f8,f8,f8,f8,f8,b1))(f8,f8,f8,f8,f8,f8,f8,f8)'
+
+@njit(_FLUX_CORE_FIXED_SIGN_SIGNATURE, cache=True, error_model='numpy')
+def _flux_core_plus(R, L, N, vn, Pn, In, Un, mode_sign):
+    return _flux_core_scalar(R, L, N, vn, Pn, In, Un, 1.0, mode_sign)
+
+@njit(_FLUX_CORE_FIXED_SIGN_SIGNATURE, cache=True, error_model='numpy')
+def _flux_core_minus(R, L, N, vn, Pn, In, Un, mode_sign):
+    return _flux_core_scalar(R, L, N, vn, Pn, In, Un, -1.0, mode_sign)
+
+def _flux_nominal(R, L, N, vn, Pn, In, Un, sign, J, gen = False):
+    ''' Estimate rotor flux from nominal motor (gen=False) or generator (gen=True) mode. '''
+    s = -1.0 if gen else 1.0
+    core = _flux_core_plus if sign > 0 else _flux_core_minus
+    Fm, Id, Iq, Ud, Uq, ok = core(R, L, N, vn, Pn, In, Un, s)
+    if not ok:
+        return _NAN, None, None, None
+        #raise ValueError('nominal mode: no solution')
+    # stability analisys
+    stable = None
+    # NaN in parameters propagates to Fm, so A is finite when Fm is
+    if not math.isnan(J) and not math.isnan(Fm):
+        stable = _is_nominal_stable(R, L, N, vn, J, Fm, Id, Iq, s)
+    # return result
+    return Fm, PointDQ(Id, Iq), PointDQ(Ud, Uq), stable
+
+def flux_from_nominal_motor_mode(R, L, N, vn, Pn, In, Un, sign: float = 1.0, J = _NAN):
+    assert sign in (1.0, -1.0)
+    return _flux_nominal(R, L, N, vn, Pn, In, Un, sign, J, gen = False)
+
+def flux_from_nominal_generator_mode(R, L, N, vn, Pn, In, Un, sign: float = 1.0, J = _NAN):
+    assert sign in (1.0, -1.0)
+    return _flux_nominal(R, L, N, vn, Pn, In, Un, sign, J, gen = True)
+
+@njit(cache=True, parallel=True, error_model='numpy')
+def _sweep_flux_nb(R, L, N, vn, Pn, In, Un, sign, mode_sign):
+    n = R.shape[0]
+    Fm, Id, Iq, Ud, Uq = np.empty(n), np.empty(n), np.empty(n), np.empty(n), np.empty(n)
+    for k in prange(n):
+        Fm[k], Id[k], Iq[k], Ud[k], Uq[k], _ = _flux_core_scalar(R[k], L[k], N[k], vn[k], Pn[k], In[k], Un[k], sign[k], mode_sign)
+    return Fm, Id, Iq, Ud, Uq
+
+def _sweep_flux(args, mode_sign):
+    ''' Run parallel solver over broadcasted float64 arrays (R, L, N, vn, Pn, In, Un, sign). '''
+    shape = args[0].shape
+    # writable contiguous copies, so single kernel specialization serves broadcast views and read-only inputs
+    result = _sweep_flux_nb(*( np.array(x).ravel() for x in args ), mode_sign)
+    return tuple( x.reshape(shape) for x in result )
+
+def sweep_flux(R, L, N, vn, Pn, In, Un, sign = 1.0, gen = False):
+    ''' Estimate rotor flux from nominal mode over grid of motor parameters in parallel.
+
+    All arguments except gen are broadcasted against each other. 
+    Unlike flux_from_nominal_*_mode_batch stability analisys is not performed.
+
+    Returns
+    -------
+    Fm, Id, Iq, Ud, Uq: ndarray
+        Rotor flux, nominal currents and voltages. NaN where solution does not exist.
+    '''
+    args = np.broadcast_arrays(*( np.asarray(x, dtype=np.float64) for x in (R, L, N, vn, Pn, In, Un, sign) ))
+    return _sweep_flux(args, -1.0 if gen else 1.0)
+
+def _flux_nominal_batch(R, L, N, vn, Pn, In, Un, sign, J, mode_sign):
+    ''' Vectorized nominal mode solver. mode_sign is 1.0 for motor mode and -1.0 for generator mode. '''
+    *args, J = np.broadcast_arrays(*( np.asarray(x, dtype=np.float64) for x in (R, L, N, vn, Pn, In, Un, sign, J) ))
+    Fm, Id, Iq, Ud, Uq = _sweep_flux(args, mode_sign)
+    # stability analisys
+    stable = np.zeros(Fm.shape, dtype=bool)
+    if not np.all(np.isnan(J)):
+        R, L, N, vn = args[:4]
+        stable = np.asarray(_is_nominal_stable(R, L, N, vn, J, Fm, Id, Iq, mode_sign))
+    # return result
+    return Fm, Id, Iq, Ud, Uq, stable
+
+def flux_from_nominal_motor_mode_batch(R, L, N, vn, Pn, In, Un, sign = 1.0, J = _NAN):
+    ''' Estimate rotor flux from nominal motor mode for arrays of motor parameters.
+
+    All arguments are broadcasted against each other.
+
+    Returns
+    -------
+    Fm, Id, Iq, Ud, Uq: ndarray
+        Rotor flux, nominal currents and voltages. NaN where solution does not exist.
+    stable: ndarray
+        Stability of nominal mode. False where J is NaN or solution does not exist.
+    '''
+    return _flux_nominal_batch(R, L, N, vn, Pn, In, Un, sign, J, 1.0)
+
+def flux_from_nominal_generator_mode_batch(R, L, N, vn, Pn, In, Un, sign = 1.0, J = _NAN):
+    ''' Estimate rotor flux from nominal generator mode for arrays of motor parameters.
+
+    All arguments are broadcasted against each other.
+
+    Returns
+    -------
+    Fm, Id, Iq, Ud, Uq: ndarray
+        Rotor flux, nominal currents and voltages. NaN where solution does not exist.
+    stable: ndarray
+        Stability of nominal mode. False where J is NaN or solution does not exist.
+    '''
+    return _flux_nominal_batch(R, L, N, vn, Pn, In, Un, sign, J, -1.0)
+
+def _flux_motor_Fm(R, L, N, vn, Pn, In, Un):
+    ''' Rotor flux from nominal motor mode (sign = 1, without stability analisys), used by derivation rules. '''
+    return _flux_core_plus(R, L, N, vn, Pn, In, Un, 1.0)[0]
 
 class _ModelBase(DeductorBaseNamed):
     ''' Incomplete model common for Rotary and Linear motors. '''
-    _ATTRIBUTES = [
+    _ATTRIBUTES = (
         BaseAttribute('L', 'H', 'Motor iductance as it present in model.', groups=['inductance']),
         BaseAttribute('L2', 'H', '2-nd motor iductance harmonic.', groups=['inductance']),
         BaseAttribute('R', 'Ohm', 'Resistance, phase resistance (resistance between zero point and phase).', groups=['resistanse']),
@@ -83,22 +196,22 @@ class _ModelBase(DeductorBaseNamed):
                          lambda L, L2: L + L2, groups=['inductance']),
         DerivedAttribute('Lq', 'H', 'Inductance along quadrature axis.', 
                          lambda L, L2: L - L2, groups=['inductance']),
-    ]
-    _DERIVATE_RULES = [
+    )
+    _DERIVATE_RULES = (
         DerivateRule('L', lambda Ld, Lq: (Ld + Lq)/2),
         DerivateRule('L2', lambda Ld, Lq: (Ld - Lq)/2),
         DerivateRule('L2', lambda L, Ld: Ld - L),
         DerivateRule('L2', lambda L, Lq: L - Lq),
-    ]
+    )
     
     def __init__(self, *args, **kwargs):
         super(_ModelBase, self).__init__(*args, **kwargs)
         # set default L2
-        if np.isnan(self.L2):
+        if math.isnan(self.L2):
             self.L2 = 0.0
 
 class ModelRotary(_ModelBase):
-    _ATTRIBUTES = [
+    _ATTRIBUTES = (
         BaseAttribute('N', None, 'Number of poles pairs.', groups=['poles']),
         BaseAttribute('J', 'kg m^2', 'Rotor inertia.', groups=['inertia']),
         AliasAttribute('n_pole_pairs', 'N', groups=['poles']),
@@ -107,81 +220,81 @@ class ModelRotary(_ModelBase):
                          lambda Fm, N: N*Fm, groups=['flux']),
         DerivedAttribute('Kt', 'Hm/A', 'Torque constant: current amplitude to force.', 
                          lambda Fm, N: 3/2*N*Fm, groups=['flux']),
-        ScaledAliasAttribute('Kemf_llrms_rpm', 2*np.pi/60 * np.sqrt(3/2), 'Kemf', 'V/rpm', 
+        ScaledAliasAttribute('Kemf_llrms_rpm', _RPM * _SQRT_3_2, 'Kemf', 'V/rpm', 
                              'Meashured back EMF constant: speed in rpms to rms line-to-line voltage.', groups=['flux']),
-        ScaledAliasAttribute('Kemf_rpm', 2*np.pi/60, 'Kemf', 'V/rpm', 
+        ScaledAliasAttribute('Kemf_rpm', _RPM, 'Kemf', 'V/rpm', 
                              'Meashured back EMF constant: speed in rpms to phase voltage amplitud.', groups=['flux']),
-        ScaledAliasAttribute('Kemf_ll', np.sqrt(3), 'Kemf', 'Vs', 
+        ScaledAliasAttribute('Kemf_ll', _SQRT_3, 'Kemf', 'Vs', 
                              'Meashured back EMF constant: speed in rad to line-to-linr voltage amplitude.', groups=['flux']),
-    ]
-    _DERIVATE_RULES = [
+    )
+    _DERIVATE_RULES = (
         DerivateRule('Fm', lambda N, Kt: Kt/(3/2*N)),
         DerivateRule('Fm', lambda N, Kemf: Kemf/N),
-    ]
+    )
 
 class ModelLinear(_ModelBase):
-    _ATTRIBUTES = [
+    _ATTRIBUTES = (
         BaseAttribute('tau', 'm', 'Pole pitch, distance between two poles.', groups=['poles']),
         BaseAttribute('m', 'kg', 'Moving part mass.', groups=['inertia']),
         AliasAttribute('pole_pitch', 'tau', groups=['poles']),
         ScaledAliasAttribute('pole_pair_pitch', 2, 'pole_pitch', 'm', 'Number of poles', groups=['poles']),
         DerivedAttribute('Kemf', 'Vs/m', 'Meashured back EMF constant: speed in m/s to phase voltage amplitude.', 
-                         lambda Fm, tau: np.pi/tau*Fm, groups=['flux']),
+                         lambda Fm, tau: math.pi/tau*Fm, groups=['flux']),
         DerivedAttribute('Kt', 'H/A', 'Torque constant: current amplitude to force.', 
-                         lambda Fm, tau: 3/2*np.pi/tau*Fm, groups=['flux']),
-        ScaledAliasAttribute('Kemf_llrms', np.sqrt(3/2), 'Kemf', 'Vs/m', 
+                         lambda Fm, tau: 3/2*math.pi/tau*Fm, groups=['flux']),
+        ScaledAliasAttribute('Kemf_llrms', _SQRT_3_2, 'Kemf', 'Vs/m', 
                              'Meashured back EMF constant: speed in m/s to rms line-to-line voltage.', groups=['flux']),
-        ScaledAliasAttribute('Kemf_ll', np.sqrt(3), 'Kemf', 'Vs/m', 
+        ScaledAliasAttribute('Kemf_ll', _SQRT_3, 'Kemf', 'Vs/m', 
                              'Meashured back EMF constant: speed in m/s to line-to-linr voltage amplitude.', groups=['flux']),
         # compatibility with rotary model
         DerivedAttribute('N', '1/m', 'Compatibility: pi/tau ', 
-                         lambda tau: np.pi/tau, groups=['compatibility']),
+                         lambda tau: math.pi/tau, groups=['compatibility']),
         DerivedAttribute('J', 'kg', 'Compatibility: m ', 
                          lambda m: m, groups=['compatibility']),
-    ]
-    _DERIVATE_RULES = [
-        DerivateRule('Fm', lambda tau, Kt: Kt/(3/2*np.pi/tau)),
-        DerivateRule('Fm', lambda tau, Kemf: Kemf/(np.pi/tau)),
-    ]
+    )
+    _DERIVATE_RULES = (
+        DerivateRule('Fm', lambda tau, Kt: Kt/(3/2*math.pi/tau)),
+        DerivateRule('Fm', lambda tau, Kemf: Kemf/(math.pi/tau)),
+    )
 
 class _NominalModeBase(DeductorBaseNamed):
     ''' Incomplete nominal mode specification common for Rotary and Linear motors. '''
-    _ATTRIBUTES = [
+    _ATTRIBUTES = (
         BaseAttribute('Un', 'V', 'Rated phase voltage amplitude (beeween phase and zero point).', groups=['rated_voltage','rated']),
         BaseAttribute('In', 'A', 'Rated current amplitude (on phase line).', groups=['rated_current','rated']),
-        ScaledAliasAttribute('rated_ac_voltage', np.sqrt(3/2), 'Un', 'V', 'Rated 3-phase rms voltage', groups=['rated_voltage', 'rated']),
-        ScaledAliasAttribute('Un_rms', np.sqrt(1/2), 'Un', 'V', 'Rated phase rms voltage'),
-        ScaledAliasAttribute('rated_dc_voltage', np.sqrt(3), 'Un', 'V', 'DC bus volatge', groups=['rated_voltage','rated']),
-        ScaledAliasAttribute('In_rms', 1.0/np.sqrt(2), 'In', 'A', 'Rated rms phase current (on phase line)'),
+        ScaledAliasAttribute('rated_ac_voltage', _SQRT_3_2, 'Un', 'V', 'Rated 3-phase rms voltage', groups=['rated_voltage', 'rated']),
+        ScaledAliasAttribute('Un_rms', _SQRT_1_2, 'Un', 'V', 'Rated phase rms voltage'),
+        ScaledAliasAttribute('rated_dc_voltage', _SQRT_3, 'Un', 'V', 'DC bus volatge', groups=['rated_voltage','rated']),
+        ScaledAliasAttribute('In_rms', 1.0/_SQRT_2, 'In', 'A', 'Rated rms phase current (on phase line)'),
         AliasAttribute('rated_current', 'In_rms', groups=['rated_current','rated']),
         AliasAttribute('rated_ac_phase_voltage', 'Un_rms', groups=['rated_voltage','rated']),
-    ]
+    )
 
 class ModelRotaryNominalMode(ModelRotary, _NominalModeBase): 
-    _ATTRIBUTES = [
+    _ATTRIBUTES = (
         BaseAttribute('vn', 'rad/s', 'Rated speed.'),
         BaseAttribute('Tn', 'Nm', 'Rated torque.'),
         AliasAttribute('rated_speed', 'vn', groups=['rated_speed','rated']),
         AliasAttribute('rated_torque', 'Tn', groups=['rated_effort','rated']),
-        ScaledAliasAttribute('rated_speed_rpm', 30/np.pi, 'vn', 'rpm', 'Rated speed.', groups=['rated_speed','rated']),
+        ScaledAliasAttribute('rated_speed_rpm', 1.0/_RPM, 'vn', 'rpm', 'Rated speed.', groups=['rated_speed','rated']),
         DerivedAttribute('Pn', 'W', 'Rated power', lambda vn, Tn: vn*Tn),
         DerivedAttribute('fn', 'Hz', 'Rated frequency (electrical).', 
-                         lambda N, vn: N*vn/(2*np.pi)),
+                         lambda N, vn: N*vn/(2*math.pi)),
         AliasAttribute('rated_power', 'Pn', groups=['rated_power', 'rated']),
         AliasAttribute('rated_frequency', 'fn', groups=['rated_speed','rated']),
-    ]
-    _DERIVATE_RULES = [
+    )
+    _DERIVATE_RULES = (
         DerivateRule('vn', lambda Pn, Tn: Pn/Tn),
-        DerivateRule('vn', lambda N, fn: 2*np.pi*fn/N),
+        DerivateRule('vn', lambda N, fn: 2*math.pi*fn/N),
         DerivateRule('Tn', lambda vn, Pn: Pn/vn),
-        DerivateRule('Fm', lambda R, L, N, vn, Pn, In, Un: flux_from_nominal_motor_mode(R, L, N, vn, Pn, In, Un, sign = 1, J = np.nan)[0]),
-    ]
-    _VALIDATORS = [
-        Validator(lambda Un_rms, In_rms, Pn: 3*Un_rms*In_rms > Pn, 'Mechanical power output must not be greater then electrical power input')
-     ]
+        DerivateRule('Fm', _flux_motor_Fm),
+    )
+    _VALIDATORS = (
+        Validator(lambda Un_rms, In_rms, Pn: 3*Un_rms*In_rms > Pn, 'Mechanical power output must not be greater then electrical power input'),
+     )
 
 class ModelLinearNominalMode(ModelLinear, _NominalModeBase): 
-    _ATTRIBUTES = [
+    _ATTRIBUTES = (
         BaseAttribute('vn', 'm/s', 'Rated speed.'),
         BaseAttribute('Fn', 'N', 'Rated force.'),
         AliasAttribute('rated_speed', 'vn', groups=['rated_speed','rated']),
@@ -193,13 +306,13 @@ class ModelLinearNominalMode(ModelLinear, _NominalModeBase):
         AliasAttribute('rated_frequency', 'fn', groups=['rated_speed','rated']),
         # compatibility with rotary model
         AliasAttribute('Tn', 'Fn', groups=['compatibility']),
-    ]
-    _DERIVATE_RULES = [
+    )
+    _DERIVATE_RULES = (
         DerivateRule('vn', lambda Pn, Fn: Pn/Fn),
         DerivateRule('vn', lambda tau, fn: 2*tau*fn),
         DerivateRule('Fn', lambda vn, Pn: Pn/vn),
-        DerivateRule('Fm', lambda R, L, tau, vn, Pn, In, Un: flux_from_nominal_motor_mode(R, L, np.pi/tau, vn, Pn, In, Un, sign = 1, J = np.nan)[0]),
-    ]
-    _VALIDATORS = [
-        Validator(lambda Un_rms, In_rms, Pn: 3*Un_rms*In_rms > Pn, 'Mechanical power output must not be greater then electrical power input')
-     ]
+        DerivateRule('Fm', lambda R, L, tau, vn, Pn, In, Un: _flux_motor_Fm(R, L, math.pi/tau, vn, Pn, In, Un)),
+    )
+    _VALIDATORS = (
+        Validator(lambda Un_rms, In_rms, Pn: 3*Un_rms*In_rms > Pn, 'Mechanical power output must not be greater then electrical power input'),
+     )